@@ -0,0 +1,104 @@
+"""Archive, output and page layout helpers shared by the single-sheet and multi-file exporters."""
+import mmap
+import os
+import secrets
+import zipfile
+from contextlib import contextmanager
+from itertools import accumulate
+from lxml import etree
+from openpyxl.packaging.relationship import get_dependents
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+from openpyxl.xml.constants import ARC_WORKBOOK, ARC_WORKBOOK_RELS, REL_NS, SHEET_MAIN_NS
+
+_NS = f"{{{SHEET_MAIN_NS}}}"
+_REL_ID = f"{{{REL_NS}}}id"
+
+# Geometry of a default ReportLab Table cell (12pt leading, 3/6pt padding), which
+# the canvas renderers reproduce so their pages match the Platypus ones
+CELL_LEADING = 12
+CELL_PADDING_X = 6
+CELL_PADDING_Y = 3
+ROW_HEIGHT = CELL_LEADING + 2 * CELL_PADDING_Y
+# SimpleDocTemplate's default page margin and its frame padding
+DOC_MARGIN = 72
+FRAME_PADDING = 6
+PAGE_MARGIN = DOC_MARGIN + FRAME_PADDING
+
+
+def text_offset(font_size, bottom_padding=CELL_PADDING_Y):
+    """Height of the baseline above the bottom of a Table cell (text is bottom-aligned)."""
+    return bottom_padding + CELL_LEADING - font_size
+
+
+def column_edges(page_width, col_widths):
+    """x of every column boundary for a table centred on the page, as Table does."""
+    return list(accumulate(col_widths, initial=(page_width - sum(col_widths)) / 2))
+
+
+def rows_per_page(height):
+    """Number of ROW_HEIGHT rows that fit in height, at least one so pages always advance."""
+    return max(int(height // ROW_HEIGHT), 1)
+
+
+@contextmanager
+def atomic_output(pdf_path):
+    """Yield a temp file path next to pdf_path and move it into place on success.
+
+    The PDF is streamed to disk rather than held in memory, and readers never
+    see a half-written file.
+    """
+    directory = os.path.dirname(pdf_path) or "."
+    while True:
+        tmp_path = os.path.join(directory, f"tmp{secrets.token_hex(4)}.pdf")
+        try:
+            # Created like a plain open() would: 0666 less the umask, which the
+            # kernel applies (tempfile's helpers always create files 0600)
+            os.close(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            break
+        except FileExistsError:
+            continue
+    try:
+        yield tmp_path
+        # Keep the mode of the file being replaced
+        try:
+            os.chmod(tmp_path, os.stat(pdf_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, pdf_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _MappedFile(mmap.mmap):
+    """mmap with the seekable() zipfile expects (mmap only gained it in Python 3.13)."""
+
+    def seekable(self):
+        return True
+
+
+@contextmanager
+def open_archive(xlsm_path):
+    """Open an XLSM/XLSX zip over a read-only memory map of the file.
+
+    Members are decompressed straight from the mapping as they are streamed,
+    instead of through buffered file reads. Anything that is not a zip,
+    including an empty file (which mmap refuses), raises zipfile.BadZipFile.
+    """
+    with open(xlsm_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise zipfile.BadZipFile(f"File is not a zip file: {xlsm_path}")
+        with _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, zipfile.ZipFile(mm) as archive:
+            yield archive
+
+
+def read_workbook_index(archive):
+    """Map sheet names to their worksheet parts and find the workbook's date epoch."""
+    with archive.open(ARC_WORKBOOK) as src:
+        root = etree.parse(src).getroot()
+    targets = {rel.Id: rel.target for rel in get_dependents(archive, ARC_WORKBOOK_RELS)}
+    sheets = {sheet.get("name"): targets[sheet.get(_REL_ID)] for sheet in root.iter(_NS + "sheet")}
+
+    props = root.find(_NS + "workbookPr")
+    date1904 = props is not None and props.get("date1904") in ("1", "true")
+    return sheets, CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
@@ -1,30 +1,82 @@
+import lxml  # must be importable before openpyxl so it picks the C XML parser
+import argparse
+from lxml import etree
 from openpyxl import load_workbook
+from openpyxl.xml.constants import SHEET_MAIN_NS
+import numpy as np
 import pandas as pd
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen.canvas import Canvas
 from datetime import datetime
+from common import (
+    CELL_LEADING, CELL_PADDING_Y, FRAME_PADDING, PAGE_MARGIN, ROW_HEIGHT,
+    atomic_output, column_edges, open_archive, read_workbook_index, rows_per_page, text_offset,
+)
+
+try:
+    import python_calamine  # noqa: F401  enables pd.read_excel(engine="calamine")
+    _HAS_CALAMINE = True
+except ImportError:
+    _HAS_CALAMINE = False
+
+_COL_TAG = f"{{{SHEET_MAIN_NS}}}col"
+_SHEET_DATA_TAG = f"{{{SHEET_MAIN_NS}}}sheetData"
+
+# Shared by the Table style and the canvas export so both lay out the same
+_FONT_SIZE = 8
+_HEADER_BOTTOM_PADDING = 6
+_SIDE_MARGIN = 20
+
+def read_column_widths(path: str, sheet_name: str = "DATA"):
+    """Read the <col> entries of a sheet as (min_col, max_col, width) without loading any cells."""
+    widths = []
+    with open_archive(path) as archive:
+        sheets, _ = read_workbook_index(archive)
+        with archive.open(sheets[sheet_name]) as src:
+            # <cols> always precedes <sheetData>, so stop before the cell data
+            for event, elem in etree.iterparse(src, events=("start", "end"), tag=(_COL_TAG, _SHEET_DATA_TAG)):
+                if elem.tag == _SHEET_DATA_TAG:
+                    break
+                if event == "end":
+                    width = elem.get("width")
+                    widths.append((int(elem.get("min")), int(elem.get("max")), float(width) if width else None))
+    return widths
 
 def read_data_sheet(path: str, sheet_name: str = "DATA"):
     """Read the evaluated values (not formulas) from the DATA sheet."""
-    wb = load_workbook(path, data_only=True)
-    ws = wb[sheet_name]
+    if _HAS_CALAMINE:
+        # Rust-backed reader, no openpyxl cells at all. Take the raw rows (header
+        # included, so labels are not renamed) with no NA parsing, so text such as
+        # "N/A" stays as written, and turn the empty cells it reports as "" into None
+        raw = pd.read_excel(path, sheet_name=sheet_name, header=None, engine="calamine", na_filter=False)
+        raw = raw.astype(object)
+        data = raw.where(raw != "", None).values.tolist()
+        del raw
+    else:
+        wb = load_workbook(path, data_only=True, read_only=True, keep_links=False)
+        data = list(wb[sheet_name].values)
+
+        # Release the workbook before building the DataFrame
+        wb.close()
+        del wb
 
     # Get column headers
-    data = list(ws.values)
     columns = data[0]
     df = pd.DataFrame(data[1:], columns=columns)
+    del data
 
-    # Extract column widths (approximate points)
-    col_widths = []
-    for col in ws.column_dimensions.values():
-        width = col.width if col.width else 10
-        # Excel width ~ 1 char = 7 points approx
-        col_widths.append(width * 7)
-    # If there are fewer column_dimensions entries than columns
-    while len(col_widths) < len(df.columns):
-        col_widths.append(70)
+    # Extract column widths (approximate points), one per DataFrame column in sheet order;
+    # a <col> entry covers columns min..max and unset columns default to 10 characters
+    n_cols = len(df.columns)
+    widths_by_col = {}
+    for min_col, max_col, width in read_column_widths(path, sheet_name):
+        for i in range(min_col, min(max_col, n_cols) + 1):
+            widths_by_col[i] = width
+    # Excel width ~ 1 char = 7 points approx
+    col_widths = [(widths_by_col.get(i + 1) or 10) * 7 for i in range(n_cols)]
 
     return df, col_widths
 
@@ -37,10 +89,48 @@ def format_value(value):
         return f"{value:,.2f}" if abs(value) < 1e7 else f"{value:,.0f}"
     return str(value) if value is not None else ""
 
+def format_column(series: pd.Series) -> list:
+    """Format a whole column at once, matching format_value cell by cell."""
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return series.dt.strftime("%Y-%m-%d").fillna("").tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        # Format each value once, with the formatter its magnitude calls for
+        values = series.to_numpy()
+        small = np.abs(values) < 1e7
+        out = np.empty(len(values), dtype=object)
+        out[small] = list(map("{:,.2f}".format, values[small].tolist()))
+        out[~small] = list(map("{:,.0f}".format, values[~small].tolist()))
+        return out.tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return series.astype(str).tolist()
+    # Mixed object columns still need the per-value type checks
+    return series.map(format_value).tolist()
+
+class StripedTable(Table):
+    """Table whose ROWBACKGROUNDS shading keeps its phase across page splits.
+
+    ReportLab restarts the color cycle on the continuation part of a split
+    table, so it is rotated by the number of rows already drawn instead.
+    _cr_1_1 is private, hence the ReportLab pin in requirements.txt.
+    """
+
+    def _cr_1_1(self, n, nRows, repeatRows, cmds, *args, **kwargs):
+        rotated = []
+        for cmd in cmds:
+            (sc, sr), (ec, er) = cmd[1:3]
+            if cmd[0] == "ROWBACKGROUNDS" and isinstance(sr, int):
+                if sr < 0:
+                    sr += nRows
+                cycle = list(cmd[3])
+                shift = max(n - sr, 0) % len(cycle)
+                cmd = cmd[:3] + (cycle[shift:] + cycle[:shift],) + tuple(cmd[4:])
+            rotated.append(cmd)
+        return super()._cr_1_1(n, nRows, repeatRows, rotated, *args, **kwargs)
+
 def dataframe_to_styled_pdf(df: pd.DataFrame, pdf_path: str, col_widths=None):
     """Export DataFrame to PDF with Excel-like formatting."""
     styles = getSampleStyleSheet()
-    doc = SimpleDocTemplate(pdf_path, pagesize=landscape(A4), leftMargin=20, rightMargin=20)
     elements = []
 
     # Title
@@ -48,10 +138,11 @@ def dataframe_to_styled_pdf(df: pd.DataFrame, pdf_path: str, col_widths=None):
     elements.append(Spacer(1, 12))
 
     # Format data
-    data = [df.columns.tolist()] + [[format_value(v) for v in row] for row in df.values]
+    columns = [format_column(series) for _, series in df.items()]
+    data = [df.columns.tolist()] + [list(row) for row in zip(*columns)]
 
     # Create table with column widths
-    table = Table(data, repeatRows=1, colWidths=col_widths)
+    table = StripedTable(data, repeatRows=1, colWidths=col_widths)
 
     # Table style similar to Excel
     style = TableStyle([
@@ -59,26 +150,110 @@ def dataframe_to_styled_pdf(df: pd.DataFrame, pdf_path: str, col_widths=None):
         ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
         ("ALIGN", (0, 0), (-1, -1), "CENTER"),
         ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 8),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 6),
+        ("FONTSIZE", (0, 0), (-1, -1), _FONT_SIZE),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), _HEADER_BOTTOM_PADDING),
         ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
     ])
 
-    # Alternate row shading
-    for i in range(1, len(data)):
-        if i % 2 == 0:
-            style.add("BACKGROUND", (0, i), (-1, i), colors.HexColor("#F2F2F2"))
+    # Alternate row shading, starting plain on the first data row
+    style.add("ROWBACKGROUNDS", (0, 1), (-1, -1), [None, colors.HexColor("#F2F2F2")])
 
     table.setStyle(style)
     elements.append(table)
-    doc.build(elements)
+    with atomic_output(pdf_path) as tmp_path:
+        doc = SimpleDocTemplate(tmp_path, pagesize=landscape(A4), leftMargin=_SIDE_MARGIN, rightMargin=_SIDE_MARGIN)
+        doc.build(elements)
+
+    print(f"✅ PDF successfully generated at: {pdf_path}")
+
+def dataframe_to_canvas_pdf(df: pd.DataFrame, pdf_path: str, col_widths=None):
+    """Export DataFrame to PDF by drawing straight onto a canvas.
+
+    Same look and pagination as dataframe_to_styled_pdf (header band, alternate
+    row shading, grid, Table cell geometry) without Platypus, so there is no
+    Table layout or style scan.
+    """
+    page_width, page_height = landscape(A4)
+    margin_x = _SIDE_MARGIN + FRAME_PADDING
+    # The header row has extra bottom padding
+    header_h = CELL_PADDING_Y + CELL_LEADING + _HEADER_BOTTOM_PADDING
+    text_dy, header_text_dy = text_offset(_FONT_SIZE), text_offset(_FONT_SIZE, _HEADER_BOTTOM_PADDING)
+
+    # Format data
+    header = [str(c) for c in df.columns]
+    columns = [format_column(series) for _, series in df.items()]
+    rows = list(zip(*columns))
+
+    # Column positions, centered like a Table in the frame
+    if col_widths is None:
+        col_widths = [(page_width - 2 * margin_x) / max(len(header), 1)] * len(header)
+    col_widths = list(col_widths[:len(header)])
+    col_x = column_edges(page_width, col_widths)
+    x0 = col_x[0]
+    centers = [(left + right) / 2 for left, right in zip(col_x, col_x[1:])]
+
+    with atomic_output(pdf_path) as tmp_path:
+        c = Canvas(tmp_path, pagesize=(page_width, page_height))
+
+        # Title (spaceBefore is dropped at the top of a frame)
+        heading = getSampleStyleSheet()["Heading2"]
+        top = page_height - PAGE_MARGIN
+        c.setFont(heading.fontName, heading.fontSize)
+        c.drawString(margin_x, top - heading.fontSize, "DATA Sheet Export")
+        top -= heading.leading + heading.spaceAfter + 12
+
+        start = 0
+        while True:
+            per_page = rows_per_page(top - header_h - PAGE_MARGIN)
+            page = rows[start:start + per_page]
+            header_y = top - header_h
+
+            # Header background and alternate row shading
+            c.setFillColor(colors.HexColor("#4F81BD"))
+            c.rect(x0, header_y, col_x[-1] - x0, header_h, stroke=0, fill=1)
+            c.setFillColor(colors.HexColor("#F2F2F2"))
+            for k in range(len(page)):
+                if (start + k + 1) % 2 == 0:
+                    c.rect(x0, header_y - (k + 1) * ROW_HEIGHT, col_x[-1] - x0, ROW_HEIGHT, stroke=0, fill=1)
+
+            c.setStrokeColor(colors.grey)
+            c.setLineWidth(0.25)
+            c.grid(col_x, [top] + [header_y - k * ROW_HEIGHT for k in range(len(page) + 1)])
+
+            c.setFillColor(colors.whitesmoke)
+            c.setFont("Helvetica-Bold", _FONT_SIZE)
+            for x, text in zip(centers, header):
+                c.drawCentredString(x, header_y + header_text_dy, text)
+
+            c.setFillColor(colors.black)
+            c.setFont("Helvetica", _FONT_SIZE)
+            for k, row in enumerate(page):
+                y = header_y - (k + 1) * ROW_HEIGHT + text_dy
+                for x, text in zip(centers, row):
+                    c.drawCentredString(x, y, text)
+
+            start += per_page
+            if start >= len(rows):
+                break
+            c.showPage()
+            top = page_height - PAGE_MARGIN
+
+        c.save()
 
     print(f"✅ PDF successfully generated at: {pdf_path}")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the DATA sheet of an XLSM workbook to PDF.")
+    parser.add_argument("--fast", action="store_true",
+                        help="draw the table directly on the canvas instead of laying it out with Platypus")
+    args = parser.parse_args()
+
     xlsm_path = "your_file.xlsm"
     pdf_path = "DATA_export.pdf"
 
     df, widths = read_data_sheet(xlsm_path, "DATA")
-    dataframe_to_styled_pdf(df, pdf_path, col_widths=widths)
+    if args.fast:
+        dataframe_to_canvas_pdf(df, pdf_path, col_widths=widths)
+    else:
+        dataframe_to_styled_pdf(df, pdf_path, col_widths=widths)
@@ -1,108 +1,503 @@
+import lxml  # must be importable before openpyxl so it picks the C XML parser
+import os
+import re
+import sys
+from string import digits
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import groupby, islice
+from multiprocessing import reduction
+from operator import itemgetter
+from types import MappingProxyType
 import pandas as pd
-from openpyxl import load_workbook
+from lxml import etree
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import from_excel, from_ISO8601
+from openpyxl.xml.constants import ARC_SHARED_STRINGS, ARC_STYLE, SHEET_MAIN_NS
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfgen.canvas import Canvas
+from common import (
+    CELL_PADDING_X, PAGE_MARGIN, ROW_HEIGHT,
+    atomic_output, column_edges, open_archive, read_workbook_index, rows_per_page, text_offset,
+)
 
-def read_data_with_full_style(xlsm_path):
-    """Read values, styles, merged cells, and column widths from the 'DATA' sheet."""
-    wb = load_workbook(xlsm_path, data_only=True)
-    if "DATA" not in wb.sheetnames:
-        raise ValueError(f"No DATA sheet found in {xlsm_path}")
+_NS = f"{{{SHEET_MAIN_NS}}}"
+_ROW_TAG = _NS + "row"
+_CELL_TAG = _NS + "c"
+_VALUE_TAG = _NS + "v"
+_COL_TAG = _NS + "col"
+_MERGE_TAG = _NS + "mergeCell"
+_DIMENSION_TAG = _NS + "dimension"
+_TEXT_TAG = _NS + "t"
+_PHONETIC_TAG = _NS + "rPh"
 
-    ws = wb["DATA"]
+_RANGE_RE = re.compile(r"\$?([A-Z]{1,3})\$?(\d+):\$?([A-Z]{1,3})\$?(\d+)$")
 
-    # --- Extract values and cell styles ---
-    values = []
-    styles = []
-    for row in ws.iter_rows():
-        row_values = []
-        row_styles = []
-        for cell in row:
-            row_values.append(cell.value)
-            # Background color
-            bg_color = None
-            if cell.fill and cell.fill.start_color and cell.fill.start_color.type == 'rgb':
-                bg_color = f"#{cell.fill.start_color.rgb[-6:]}"  # keep only hex color
-
-            row_styles.append({
-                "bg_color": bg_color,
-                "bold": cell.font.bold,
-                "italic": cell.font.italic,
-                "align": (cell.alignment.horizontal or "left").upper(),
-            })
+# Cell styles are read-only mappings: cells with the same style id share one
+_DEFAULT_STYLE = MappingProxyType({"bg_color": None, "bold": False, "italic": False, "align": "LEFT"})
+
+# Built TableStyles keyed by _style_signature, for repeated template-shaped reports
+_STYLE_CACHE_SIZE = 32
+_style_cache = {}
+# Every style field _build_table_style reads
+_STYLE_FIELDS = itemgetter("bg_color", "bold", "italic", "align")
+
+# Tables with more cells than this are drawn straight onto the canvas
+DIRECT_DRAW_THRESHOLD = 5000
+# Table's default font size, and where its text sits in a row
+_FONT_SIZE = 10
+_BASELINE = text_offset(_FONT_SIZE)
+
+
+def _read_only_style(items):
+    """Rebuild a pickled style mapping (mappingproxy itself cannot be pickled)."""
+    return MappingProxyType(items)
+
+
+# Worker processes send styles back to combine_multiple_xlsm by pickling
+reduction.register(MappingProxyType, lambda style: (_read_only_style, (dict(style),)))
+
+
+def _flag(elem):
+    """Read an OOXML boolean element such as <b/> or <i val="0"/>."""
+    return elem is not None and elem.get("val", "1") not in ("0", "false")
+
+
+def read_style_table(archive):
+    """Resolve every cell format in styles.xml to a read-only style mapping, indexed by style id.
+
+    Also returns the set of style ids whose number format displays a date.
+    """
+    try:
+        src = archive.open(ARC_STYLE)
+    except KeyError:
+        return [_DEFAULT_STYLE], set()
+    with src:
+        root = etree.parse(src).getroot()
+
+    num_formats = dict(BUILTIN_FORMATS)
+    for fmt in root.iterfind(f"{_NS}numFmts/{_NS}numFmt"):
+        num_formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+
+    fonts = [
+        (_flag(font.find(_NS + "b")), _flag(font.find(_NS + "i")))
+        for font in root.iterfind(f"{_NS}fonts/{_NS}font")
+    ]
+
+    # Background color: only pattern fills with an explicit rgb are visible
+    fills = []
+    for fill in root.iterfind(f"{_NS}fills/{_NS}fill"):
+        bg_color = None
+        pattern = fill.find(_NS + "patternFill")
+        if pattern is not None and pattern.get("patternType", "none") != "none":
+            fg = pattern.find(_NS + "fgColor")
+            if fg is not None and fg.get("rgb"):
+                bg_color = f"#{fg.get('rgb')[-6:]}"  # keep only hex color
+        fills.append(bg_color)
+
+    style_table = []
+    date_styles = set()
+    for style_id, xf in enumerate(root.iterfind(f"{_NS}cellXfs/{_NS}xf")):
+        bold, italic = fonts[int(xf.get("fontId", 0))] if fonts else (False, False)
+        alignment = xf.find(_NS + "alignment")
+        horizontal = alignment.get("horizontal") if alignment is not None else None
+        style_table.append(MappingProxyType({
+            "bg_color": fills[int(xf.get("fillId", 0))] if fills else None,
+            "bold": bold,
+            "italic": italic,
+            "align": (horizontal or "left").upper(),
+        }))
+        if is_date_format(num_formats.get(int(xf.get("numFmtId", 0)))):
+            date_styles.add(style_id)
+
+    return style_table or [_DEFAULT_STYLE], date_styles
+
+
+def read_shared_strings(archive):
+    """Read the shared strings table, skipping phonetic (rPh) runs.
+
+    Strings are interned so repeated labels across cells and files compare by identity.
+    """
+    try:
+        src = archive.open(ARC_SHARED_STRINGS)
+    except KeyError:
+        return []
+
+    strings = []
+    with src:
+        for _, si in etree.iterparse(src, events=("end",), tag=_NS + "si"):
+            strings.append(_string_text(si))
+            si.clear()
+    return strings
+
+
+def _string_text(elem):
+    """Interned text of an <si> or inline <is> string, without its phonetic (rPh) runs."""
+    return sys.intern("".join(
+        t.text or "" for t in elem.iter(_TEXT_TAG) if t.getparent().tag != _PHONETIC_TAG
+    ))
+
+
+def _cell_value(cell, shared_strings, is_date, epoch):
+    """Decode the cached value of a <c> element the way openpyxl does with data_only=True."""
+    data_type = cell.get("t", "n")
+    if data_type == "inlineStr":
+        inline = cell.find(_NS + "is")
+        return _string_text(inline) if inline is not None else None
+
+    value = cell.findtext(_VALUE_TAG) or None
+    if value is None:
+        return None
+    if data_type == "n":
+        value = float(value) if "." in value or "E" in value or "e" in value else int(value)
+        return from_excel(value, epoch) if is_date else value
+    if data_type == "s":
+        return shared_strings[int(value)]
+    if data_type == "b":
+        return bool(int(value))
+    if data_type == "d":
+        return from_ISO8601(value)
+    return value  # "str" formula results and "e" errors
+
+
+def iter_rows_with_style(xlsm_path):
+    """Yield (row_values, row_styles) for each row of the 'DATA' sheet.
+
+    The sheet XML is streamed with lxml instead of going through openpyxl
+    cells, so each cell costs one style table lookup rather than a chain of
+    font/fill/alignment attribute resolutions. Cells with the same style id
+    share one read-only style mapping. Rows are padded to the sheet
+    dimension when the file records one, and cells the sheet leaves out get
+    the workbook's default style (style id 0), as in openpyxl. Once
+    exhausted, the generator returns (merged_ranges, col_widths, default_style).
+    """
+    with open_archive(xlsm_path) as archive:
+        sheets, epoch = read_workbook_index(archive)
+        if "DATA" not in sheets:
+            raise ValueError(f"No DATA sheet found in {xlsm_path}")
+
+        style_table, date_styles = read_style_table(archive)
+        shared_strings = read_shared_strings(archive)
+        default_style = style_table[0]
+        # Resolve each raw s="..." attribute to (style, is_date) once per workbook
+        cell_formats = {str(i): (style, i in date_styles) for i, style in enumerate(style_table)}
+        cell_formats[None] = cell_formats["0"]
+        col_indices = {}
+
+        n_cols = 0
+        n_rows = 0
+        merged_ranges = []
+        col_widths = []
+        with archive.open(sheets["DATA"]) as src:
+            tags = (_ROW_TAG, _COL_TAG, _MERGE_TAG, _DIMENSION_TAG)
+            for _, elem in etree.iterparse(src, events=("end",), tag=tags):
+                if elem.tag == _ROW_TAG:
+                    # --- Extract values and cell styles ---
+                    # Rows missing from the XML are empty
+                    row_idx = int(elem.get("r", n_rows + 1))
+                    while n_rows < row_idx - 1:
+                        n_rows += 1
+                        yield [None] * n_cols, [default_style] * n_cols
+
+                    # Preallocate to the sheet width and assign cells by column
+                    row_values = [None] * n_cols
+                    row_styles = [default_style] * n_cols
+                    col_idx = 0
+                    for cell in elem.iter(_CELL_TAG):
+                        ref = cell.get("r")
+                        if ref:
+                            letters = ref.rstrip(digits)
+                            col_idx = col_indices.get(letters)
+                            if col_idx is None:
+                                col_idx = col_indices[letters] = column_index_from_string(letters)
+                        else:
+                            col_idx += 1
+                        if col_idx > len(row_values):
+                            # Cell outside the recorded dimension (or none recorded)
+                            grow = col_idx - len(row_values)
+                            row_values.extend([None] * grow)
+                            row_styles.extend([default_style] * grow)
+
+                        style, is_date = cell_formats[cell.get("s")]
+                        row_values[col_idx - 1] = _cell_value(cell, shared_strings, is_date, epoch)
+                        row_styles[col_idx - 1] = style
+
+                    n_rows += 1
+                    yield row_values, row_styles
+                elif elem.tag == _COL_TAG:
+                    # --- Extract column widths ---
+                    width = elem.get("width")
+                    # Scale Excel width (rough approximation to ReportLab units)
+                    col_widths.append(float(width) * 5 if width else 60)
+                elif elem.tag == _MERGE_TAG:
+                    # --- Extract merged cell ranges ---
+                    merged_ranges.append(elem.get("ref"))  # e.g. "A1:C1"
+                else:
+                    # <dimension> precedes the cell data
+                    n_cols = range_boundaries(elem.get("ref"))[2]
+
+                # Drop parsed elements so memory stays bounded by one row
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    # Fill widths if missing
+    if len(col_widths) < n_cols:
+        col_widths += [60] * (n_cols - len(col_widths))
+
+    return merged_ranges, col_widths, default_style
+
+
+def extend_with_rows(rows, values, styles, skip_header=False):
+    """Drain an iter_rows_with_style generator into values/styles.
+
+    Returns the generator's (merged_ranges, col_widths, default_style).
+    """
+    while True:
+        try:
+            row_values, row_styles = next(rows)
+        except StopIteration as done:
+            return done.value
+        if skip_header:
+            skip_header = False
+            continue
         values.append(row_values)
         styles.append(row_styles)
 
-    # --- Extract merged cell ranges ---
-    merged_ranges = []
-    for merged in ws.merged_cells.ranges:
-        merged_ranges.append(str(merged))  # e.g. "A1:C1"
 
-    # --- Extract column widths ---
-    col_widths = []
-    for col_letter, col_dim in ws.column_dimensions.items():
-        if col_dim.width:
-            # Scale Excel width (rough approximation to ReportLab units)
-            col_widths.append(col_dim.width * 5)
-        else:
-            col_widths.append(60)
+def pad_rows(values, styles, col_widths, defaults):
+    """Pad every row (and col_widths) out to the widest row, in place.
+
+    Rows are only padded to the sheet <dimension> while streaming, and that
+    element may be missing or stale, so the final grid is squared up here.
+    defaults lists (first_row, default_style) for each workbook the rows came
+    from, so added cells get their workbook's default style as in streaming.
+    """
+    n_cols = max(map(len, values), default=0)
+    stops = [first_row for first_row, _ in defaults[1:]] + [len(values)]
+    for (first_row, default_style), stop in zip(defaults, stops):
+        for row_values, row_styles in zip(values[first_row:stop], styles[first_row:stop]):
+            if len(row_values) < n_cols:
+                row_styles.extend([default_style] * (n_cols - len(row_values)))
+                row_values.extend([None] * (n_cols - len(row_values)))
 
     # Fill widths if missing
-    n_cols = len(values[0]) if values else 0
     if len(col_widths) < n_cols:
         col_widths += [60] * (n_cols - len(col_widths))
 
-    wb.close()
-    return values, styles, merged_ranges, col_widths
+
+def read_data_with_full_style(xlsm_path):
+    """Read values, styles, merged cells, and column widths from the 'DATA' sheet.
+
+    Styles are read-only mappings shared between cells; copy one with dict()
+    to change it for a single cell.
+    """
+    return _read_workbook(xlsm_path)[:4]
+
+
+def _read_workbook(xlsm_path):
+    """read_data_with_full_style, plus the workbook's default style for padding."""
+    values = []
+    styles = []
+    merged_ranges, col_widths, default_style = extend_with_rows(iter_rows_with_style(xlsm_path), values, styles)
+    pad_rows(values, styles, col_widths, [(0, default_style)])
+    return values, styles, merged_ranges, col_widths, default_style
 
 
 def combine_multiple_xlsm(files):
-    """Combine data and style from multiple XLSM DATA sheets."""
+    """Combine data and style from multiple XLSM DATA sheets.
+
+    Files are parsed in parallel worker processes; with a single file (or a
+    single CPU) rows are streamed straight into the combined lists instead.
+    """
+    files = list(files)
     combined_values = []
     combined_styles = []
     combined_merges = []
     col_widths = []
+    defaults = []  # (first combined row, default style) of each file
     headers_added = False
 
+    workers = min(len(files), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            for values, styles, merges, widths, default_style in ex.map(_read_workbook, files):
+                defaults.append((len(combined_values), default_style))
+                # skip header row for next files
+                start = 1 if headers_added else 0
+                combined_values.extend(islice(values, start, None))
+                combined_styles.extend(islice(styles, start, None))
+                combined_merges.extend(merges)
+                if not headers_added:
+                    col_widths = widths
+                    headers_added = True
+        pad_rows(combined_values, combined_styles, col_widths, defaults)
+        return combined_values, combined_styles, combined_merges, col_widths
+
     for f in files:
-        values, styles, merges, widths = read_data_with_full_style(f)
+        # Rows go straight into the combined lists, skipping the header row for next files
+        rows = iter_rows_with_style(f)
+        first_row = len(combined_values)
+        merges, widths, default_style = extend_with_rows(rows, combined_values, combined_styles, skip_header=headers_added)
+        defaults.append((first_row, default_style))
+        combined_merges.extend(merges)
         if not headers_added:
-            combined_values.extend(values)
-            combined_styles.extend(styles)
-            combined_merges.extend(merges)
             col_widths = widths
             headers_added = True
-        else:
-            # skip header row for next files
-            combined_values.extend(values[1:])
-            combined_styles.extend(styles[1:])
-            combined_merges.extend(merges)
 
+    pad_rows(combined_values, combined_styles, col_widths, defaults)
     return combined_values, combined_styles, combined_merges, col_widths
 
 
 def excel_range_to_indices(range_str):
     """Convert Excel range like 'A1:C1' to numeric coordinates."""
-    from openpyxl.utils import range_boundaries
-    min_col, min_row, max_col, max_row = range_boundaries(range_str)
+    match = _RANGE_RE.match(range_str)
+    if match is None:
+        # Single cells and whole-row/column references
+        min_col, min_row, max_col, max_row = range_boundaries(range_str)
+    else:
+        min_col_letters, min_row, max_col_letters, max_row = match.groups()
+        min_col = column_index_from_string(min_col_letters)
+        max_col = column_index_from_string(max_col_letters)
+        min_row, max_row = int(min_row), int(max_row)
     return (min_col - 1, min_row - 1, max_col - 1, max_row - 1)
 
 
-def generate_full_styled_pdf(values, styles, merged_ranges, col_widths, pdf_path, title="Combined DATA Sheets"):
-    """Generate a PDF preserving colors, fonts, alignment, merges, and column widths."""
-    doc = SimpleDocTemplate(pdf_path, pagesize=landscape(A4))
-    elements = []
-    stylesheets = getSampleStyleSheet()
+def _font_name(cell_style):
+    if cell_style["bold"]:
+        return 'Helvetica-Bold'
+    if cell_style["italic"]:
+        return 'Helvetica-Oblique'
+    return 'Helvetica'
 
-    elements.append(Paragraph(title, stylesheets["Title"]))
-    elements.append(Spacer(1, 12))
 
+@lru_cache(maxsize=256)
+def _hex_color(hex_str):
+    """Parse a '#RRGGBB' string once; sheets only use a handful of colors. None if invalid."""
+    try:
+        return colors.HexColor(hex_str)
+    except ValueError:
+        return None
+
+
+def _style_runs(row_styles, key):
+    """Collapse a row of cell styles into (first_col, last_col, value) runs of equal key."""
+    c = 0
+    for value, run in groupby(row_styles, key=key):
+        n = sum(1 for _ in run)
+        yield c, c + n - 1, value
+        c += n
+
+
+def _draw_table_direct(canvas, values, styles, col_widths, merged_ranges, top):
+    """Draw the table with canvas primitives instead of a Platypus Table.
+
+    Produces the same layout as the Table path in generate_full_styled_pdf:
+    header row repeated on each page, grid, per-cell background, font and
+    alignment, and merged spans (clipped at page breaks). Backgrounds are
+    batched per color and text per font, so each costs one state change.
+    """
+    page_width, page_height = landscape(A4)
     n_rows = len(values)
-    n_cols = len(values[0]) if n_rows else 0
+    n_cols = len(col_widths)
+    col_x = column_edges(page_width, col_widths)
 
-    table = Table(values, repeatRows=1, colWidths=col_widths[:n_cols])
+    # Merged ranges: top-left cell -> bottom-right cell, everything else is skipped
+    spans = {}
+    covered = set()
+    for ref in merged_ranges:
+        c1, r1, c2, r2 = excel_range_to_indices(ref)
+        spans[(r1, c1)] = (r2, c2)
+        covered.update((r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1))
+        covered.discard((r1, c1))
+
+    header_style = {"bg_color": colors.lightgrey, "bold": True, "italic": False, "align": "CENTER"}
+
+    start = 1
+    while True:
+        capacity = rows_per_page(top - PAGE_MARGIN - ROW_HEIGHT)  # below the header row
+        page_rows = [0] + list(range(start, min(start + capacity, n_rows))) if n_rows else []
+        row_y = {r: top - (i + 1) * ROW_HEIGHT for i, r in enumerate(page_rows)}
+
+        fills = defaultdict(list)
+        outlines = []
+        texts = defaultdict(list)
+        for r in page_rows:
+            for c in range(n_cols):
+                if (r, c) in covered:
+                    continue
+                r2, c2 = spans.get((r, c), (r, c))
+                if r2 not in row_y:
+                    r2 = max(row for row in row_y if row <= r2) if r2 > r else r
+                x = col_x[c]
+                w = col_x[c2 + 1] - x
+                y = row_y[r2]
+                h = row_y[r] + ROW_HEIGHT - y
+                outlines.append((x, y, w, h))
+
+                cell_style = header_style if r == 0 else styles[r][c]
+                # Background
+                bg = cell_style["bg_color"]
+                if isinstance(bg, str):
+                    bg = _hex_color(bg)
+                if bg is not None:
+                    fills[bg].append((x, y, w, h))
+
+                value = values[r][c]
+                if value is None or value == "":
+                    continue
+                align = cell_style["align"] if cell_style["align"] in ('CENTER', 'RIGHT') else 'LEFT'
+                texts[_font_name(cell_style)].append((align, x, y, w, str(value)))
+
+        for color, rects in fills.items():
+            canvas.setFillColor(color)
+            for rect in rects:
+                canvas.rect(*rect, stroke=0, fill=1)
+
+        canvas.setStrokeColor(colors.grey)
+        canvas.setLineWidth(0.25)
+        for rect in outlines:
+            canvas.rect(*rect, stroke=1, fill=0)
+
+        canvas.setFillColor(colors.black)
+        for font, items in texts.items():
+            canvas.setFont(font, _FONT_SIZE)
+            for align, x, y, w, text in items:
+                if align == 'CENTER':
+                    canvas.drawCentredString(x + w / 2, y + _BASELINE, text)
+                elif align == 'RIGHT':
+                    canvas.drawRightString(x + w - CELL_PADDING_X, y + _BASELINE, text)
+                else:
+                    canvas.drawString(x + CELL_PADDING_X, y + _BASELINE, text)
+
+        start += capacity
+        if start >= n_rows:
+            break
+        canvas.showPage()
+        top = page_height - PAGE_MARGIN
+
+
+def _style_signature(styles, merged_ranges, n_rows, n_cols):
+    """Key for _build_table_style: the shape, the merges and the values of every cell style.
+
+    Keyed on contents rather than dict identity, so a style edited in place
+    misses the cache. Equal cell styles share one tuple in the key.
+    """
+    seen = {}
+    rows = []
+    for row_styles in styles[:n_rows]:
+        cells = list(map(_STYLE_FIELDS, row_styles[:n_cols]))
+        rows.append(tuple(map(seen.setdefault, cells, cells)))
+    return (n_rows, n_cols, tuple(merged_ranges), tuple(rows))
+
+
+def _build_table_style(styles, merged_ranges, n_rows, n_cols):
+    """Build the TableStyle for the Platypus path of generate_full_styled_pdf."""
     tstyle = TableStyle([('GRID', (0,0), (-1,-1), 0.25, colors.grey)])
 
     # --- Apply merged cells ---
@@ -110,33 +505,69 @@ def generate_full_styled_pdf(values, styles, merged_ranges, col_widths, pdf_path
         c1, r1, c2, r2 = excel_range_to_indices(r)
         tstyle.add('SPAN', (c1, r1), (c2, r2))
 
-    # --- Apply per-cell styles ---
+    # --- Apply per-cell styles, one command per horizontal run ---
     for r in range(n_rows):
-        for c in range(n_cols):
-            cell_style = styles[r][c]
-            # Background
-            if cell_style["bg_color"]:
-                try:
-                    tstyle.add('BACKGROUND', (c, r), (c, r), colors.HexColor(cell_style["bg_color"]))
-                except:
-                    pass
-            # Bold / Italic
-            if cell_style["bold"]:
-                tstyle.add('FONTNAME', (c, r), (c, r), 'Helvetica-Bold')
-            elif cell_style["italic"]:
-                tstyle.add('FONTNAME', (c, r), (c, r), 'Helvetica-Oblique')
-            # Alignment
-            if cell_style["align"] in ['LEFT', 'CENTER', 'RIGHT']:
-                tstyle.add('ALIGN', (c, r), (c, r), cell_style["align"])
+        row_styles = styles[r][:n_cols]
+        # Background
+        for c1, c2, bg_color in _style_runs(row_styles, itemgetter("bg_color")):
+            if bg_color and _hex_color(bg_color) is not None:
+                tstyle.add('BACKGROUND', (c1, r), (c2, r), _hex_color(bg_color))
+        # Bold / Italic
+        for c1, c2, font_name in _style_runs(row_styles, _font_name):
+            if font_name != 'Helvetica':
+                tstyle.add('FONTNAME', (c1, r), (c2, r), font_name)
+        # Alignment
+        for c1, c2, align in _style_runs(row_styles, itemgetter("align")):
+            if align in ['LEFT', 'CENTER', 'RIGHT']:
+                tstyle.add('ALIGN', (c1, r), (c2, r), align)
 
     # --- Header styling ---
     tstyle.add('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey)
     tstyle.add('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold')
     tstyle.add('ALIGN', (0, 0), (-1, 0), 'CENTER')
+    return tstyle
+
+
+def generate_full_styled_pdf(values, styles, merged_ranges, col_widths, pdf_path, title="Combined DATA Sheets"):
+    """Generate a PDF preserving colors, fonts, alignment, merges, and column widths."""
+    n_rows = len(values)
+    n_cols = len(values[0]) if n_rows else 0
+
+    # Large tables skip Platypus: TableStyle rescans its command list for every cell
+    if n_rows * n_cols > DIRECT_DRAW_THRESHOLD:
+        title_style = getSampleStyleSheet()["Title"]
+        page_width, page_height = landscape(A4)
+        with atomic_output(pdf_path) as tmp_path:
+            canvas = Canvas(tmp_path, pagesize=(page_width, page_height))
+            canvas.setFont(title_style.fontName, title_style.fontSize)
+            title_top = page_height - PAGE_MARGIN
+            canvas.drawCentredString(page_width / 2, title_top - title_style.fontSize, title)
+            top = title_top - title_style.leading - title_style.spaceAfter - 12
+            _draw_table_direct(canvas, values, styles, col_widths[:n_cols], merged_ranges, top)
+            canvas.save()
+        return
+
+    elements = []
+    stylesheets = getSampleStyleSheet()
+
+    elements.append(Paragraph(title, stylesheets["Title"]))
+    elements.append(Spacer(1, 12))
+
+    table = Table(values, repeatRows=1, colWidths=col_widths[:n_cols])
+    # Same shape, merges and style grid -> same commands, so reuse the built style
+    sig = _style_signature(styles, merged_ranges, n_rows, n_cols)
+    tstyle = _style_cache.get(sig)
+    if tstyle is None:
+        tstyle = _build_table_style(styles, merged_ranges, n_rows, n_cols)
+        if len(_style_cache) >= _STYLE_CACHE_SIZE:
+            del _style_cache[next(iter(_style_cache))]  # evict the oldest entry
+        _style_cache[sig] = tstyle
 
     table.setStyle(tstyle)
     elements.append(table)
-    doc.build(elements)
+    with atomic_output(pdf_path) as tmp_path:
+        doc = SimpleDocTemplate(tmp_path, pagesize=landscape(A4))
+        doc.build(elements)
 
 
 def process_xlsm_files_fully_styled(xlsm_files, output_pdf="combined_fully_styled.pdf"):
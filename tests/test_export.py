@@ -0,0 +1,62 @@
+"""Row shading of main.py's exports across page breaks."""
+import pandas as pd
+import pytest
+from reportlab.lib import colors
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate
+
+import main
+
+_SHADE = colors.HexColor("#F2F2F2")
+
+
+class _RecordingCanvas(Canvas):
+    """Canvas that keeps the shaded rects and the text drawn on each page."""
+
+    shaded = []
+    texts = []
+
+    def setFillColor(self, color, alpha=None):
+        self._recorded_fill = color
+        super().setFillColor(color, alpha)
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        if fill and getattr(self, "_recorded_fill", None) == _SHADE:
+            bottom, top = sorted((y, y + height))
+            self.shaded.append((self.getPageNumber(), bottom, top))
+        super().rect(x, y, width, height, stroke=stroke, fill=fill)
+
+    def drawCentredString(self, x, y, text, *args, **kwargs):
+        self.texts.append((self.getPageNumber(), y, text))
+        super().drawCentredString(x, y, text, *args, **kwargs)
+
+
+class _RecordingDoc(SimpleDocTemplate):
+    def build(self, flowables, **kwargs):
+        super().build(flowables, canvasmaker=_RecordingCanvas)
+
+
+@pytest.mark.parametrize("export", ["dataframe_to_styled_pdf", "dataframe_to_canvas_pdf"])
+def test_shading_alternates_across_pages(tmp_path, monkeypatch, export):
+    monkeypatch.setattr(main, "SimpleDocTemplate", _RecordingDoc)
+    monkeypatch.setattr(main, "Canvas", _RecordingCanvas)
+    _RecordingCanvas.shaded.clear()
+    _RecordingCanvas.texts.clear()
+
+    n_rows = 151
+    df = pd.DataFrame({"n": range(1, n_rows + 1), "label": [f"row {i}" for i in range(1, n_rows + 1)]})
+    getattr(main, export)(df, str(tmp_path / "out.pdf"), col_widths=[60, 120])
+
+    # Which data rows (numbered by their first cell) sit inside a shaded band
+    shaded_rows = set()
+    row_pages = set()
+    for page, y, text in _RecordingCanvas.texts:
+        if not text.isdigit():
+            continue
+        row_pages.add(page)
+        if any(p == page and bottom < y < top for p, bottom, top in _RecordingCanvas.shaded):
+            shaded_rows.add(int(text))
+
+    assert len(row_pages) > 2
+    # Plain first data row, then alternating, whatever page a row lands on
+    assert shaded_rows == set(range(2, n_rows + 1, 2))
@@ -0,0 +1,198 @@
+"""The lxml reader in test.py must read a sheet the way openpyxl does."""
+import zipfile
+from datetime import datetime
+
+import pytest
+from lxml import etree
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+from openpyxl.xml.constants import (
+    ARC_CONTENT_TYPES, ARC_SHARED_STRINGS, ARC_STYLE, SHEET_MAIN_NS, SHARED_STRINGS,
+)
+
+from test import combine_multiple_xlsm, read_data_with_full_style
+
+_NS = f"{{{SHEET_MAIN_NS}}}"
+
+
+def _rewrite_parts(path, rewrite):
+    """Apply rewrite to a {part name: bytes} dict of the workbook and save it back."""
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    rewrite(parts)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+
+def _add_excel_markup(parts, sheet_part="xl/worksheets/sheet2.xml", row_ref="1"):
+    """Add markup only Excel writes to a sheet saved by openpyxl.
+
+    The inline strings of one row move into a shared strings table (openpyxl
+    writes every string inline), and every string gets a phonetic reading.
+    """
+    sheet = etree.fromstring(parts[sheet_part])
+    sst = etree.Element(_NS + "sst")
+    for cell in sheet.iterfind(f"{_NS}sheetData/{_NS}row[@r='{row_ref}']/{_NS}c[@t='inlineStr']"):
+        inline = cell.find(_NS + "is")
+        etree.SubElement(sst, _NS + "si").append(inline.find(_NS + "t"))
+        cell.remove(inline)
+        cell.set("t", "s")
+        etree.SubElement(cell, _NS + "v").text = str(len(sst) - 1)
+    for string in [*sst, *sheet.iter(_NS + "is")]:
+        phonetic = etree.SubElement(string, _NS + "rPh", sb="0", eb="1")
+        etree.SubElement(phonetic, _NS + "t").text = "yomi"
+    parts[sheet_part] = etree.tostring(sheet)
+    parts[ARC_SHARED_STRINGS] = etree.tostring(sst)
+
+    types = etree.fromstring(parts[ARC_CONTENT_TYPES])
+    override = etree.SubElement(types, types.tag.replace("Types", "Override"))
+    override.set("PartName", "/" + ARC_SHARED_STRINGS)
+    override.set("ContentType", SHARED_STRINGS)
+    parts[ARC_CONTENT_TYPES] = etree.tostring(types)
+
+
+def _drop_dimension_and_bold_default(parts, sheet_part="xl/worksheets/sheet1.xml"):
+    """Leave out the sheet <dimension> and make the workbook's default font bold."""
+    sheet = etree.fromstring(parts[sheet_part])
+    sheet.remove(sheet.find(_NS + "dimension"))
+    parts[sheet_part] = etree.tostring(sheet)
+
+    stylesheet = etree.fromstring(parts[ARC_STYLE])
+    etree.SubElement(stylesheet.find(f"{_NS}fonts/{_NS}font"), _NS + "b")
+    parts[ARC_STYLE] = etree.tostring(stylesheet)
+
+
+def _write_workbook(path):
+    wb = Workbook()
+    wb.epoch = CALENDAR_MAC_1904
+    # DATA is deliberately not the first sheet
+    wb.active.title = "Notes"
+    wb.active["A1"] = "not the data"
+    ws = wb.create_sheet("DATA")
+
+    ws.append(["Name", "When", "Amount", "Flag", "Note"])
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal="center")
+    ws["A2"] = "alpha"
+    ws["B2"] = datetime(2024, 2, 29, 13, 30)
+    ws["B2"].fill = PatternFill("solid", fgColor="FFCC00")
+    ws["C2"] = 1.5
+    ws["D2"] = True
+    ws["E2"] = CellRichText(["rich ", TextBlock(InlineFont(b=True), "text")])
+    # Row 3 is missing, and row 4 skips cells
+    ws["A4"] = "gamma"
+    ws["A4"].font = Font(italic=True)
+    ws["C4"] = 42
+    ws["C4"].alignment = Alignment(horizontal="right")
+    ws["E4"] = datetime(1904, 1, 2)
+    ws["A6"] = "merged"
+    ws.merge_cells("A6:B7")
+
+    ws.column_dimensions["A"].width = 12
+    # One <col> element covering B:D
+    ws.column_dimensions["B"].width = 20
+    ws.column_dimensions["B"].min, ws.column_dimensions["B"].max = 2, 4
+    wb.save(path)
+    _rewrite_parts(path, _add_excel_markup)
+
+
+def _read_with_openpyxl(path):
+    """What read_data_with_full_style returned when it went through openpyxl cells."""
+    wb = load_workbook(path, data_only=True)
+    ws = wb["DATA"]
+    values = []
+    styles = []
+    for row in ws.iter_rows():
+        values.append([cell.value for cell in row])
+        styles.append([
+            {
+                "bg_color": f"#{cell.fill.fgColor.rgb[-6:]}"
+                if cell.fill.fill_type and cell.fill.fgColor.type == "rgb" else None,
+                "bold": bool(cell.font.bold),
+                "italic": bool(cell.font.italic),
+                "align": (cell.alignment.horizontal or "left").upper(),
+            }
+            for cell in row
+        ])
+    merged_ranges = [str(merged) for merged in ws.merged_cells.ranges]
+    col_widths = [dim.width * 5 if dim.width else 60 for dim in ws.column_dimensions.values()]
+    wb.close()
+    return values, styles, merged_ranges, col_widths
+
+
+def test_matches_openpyxl(tmp_path):
+    path = tmp_path / "report.xlsx"
+    _write_workbook(path)
+
+    values, styles, merged_ranges, col_widths = read_data_with_full_style(path)
+    expected_values, expected_styles, expected_merges, expected_widths = _read_with_openpyxl(path)
+
+    assert values == expected_values
+    assert [[dict(style) for style in row] for row in styles] == expected_styles
+    assert merged_ranges == expected_merges
+    assert col_widths[:len(expected_widths)] == expected_widths
+    # Spot checks, so a shared mistake in both readers still shows up
+    assert values[0] == ["Name", "When", "Amount", "Flag", "Note"]
+    assert values[1] == ["alpha", datetime(2024, 2, 29, 13, 30), 1.5, True, "rich text"]
+    assert values[2] == [None] * 5
+    assert values[3][4] == datetime(1904, 1, 2)
+    assert styles[1][1]["bg_color"] == "#FFCC00"
+
+
+def test_ragged_rows_match_openpyxl(tmp_path):
+    path = tmp_path / "ragged.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "DATA"
+    ws.append(["a", "b"])
+    ws.append(["c"])
+    ws.append(["d", "e", "f", "g"])
+    wb.save(path)
+    _rewrite_parts(path, _drop_dimension_and_bold_default)
+
+    values, styles, _, col_widths = read_data_with_full_style(path)
+    expected_values, expected_styles, _, _ = _read_with_openpyxl(path)
+
+    assert values == expected_values
+    # Cells added while streaming and while squaring up both get the bold default
+    assert [[dict(style) for style in row] for row in styles] == expected_styles
+    assert all(style["bold"] for row in styles for style in row)
+    assert len(col_widths) == 4
+
+    # Also when a narrower workbook is combined with a wider one
+    wide = tmp_path / "wide.xlsx"
+    wb = Workbook()
+    wb.active.title = "DATA"
+    for row in expected_values:
+        wb.active.append(row + [None, "x"])
+    wb.save(wide)
+    values, styles, _, _ = combine_multiple_xlsm([wide, path])
+    assert all(len(row) == 6 for row in values)
+    assert all(style["bold"] for row in styles[3:] for style in row)
+    assert not any(style["bold"] for row in styles[:3] for style in row)
+
+
+def test_styles_are_read_only(tmp_path):
+    path = tmp_path / "report.xlsx"
+    _write_workbook(path)
+    _, styles, _, _ = read_data_with_full_style(path)
+    try:
+        styles[1][0]["bold"] = True
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("style mappings must not be writable")
+
+
+@pytest.mark.parametrize("size", [0, 300])
+def test_empty_or_truncated_file_is_not_a_workbook(tmp_path, size):
+    path = tmp_path / "report.xlsx"
+    _write_workbook(path)
+    path.write_bytes(path.read_bytes()[:size])
+    with pytest.raises(zipfile.BadZipFile):
+        read_data_with_full_style(path)